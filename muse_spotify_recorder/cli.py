@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 
 import typer
@@ -25,6 +26,10 @@ def run_session_cmd(
         0.0,
         help="Seconds of data BEFORE detected Spotify play to keep (if available).",
     ),
+    file_format: str = typer.Option(
+        "csv",
+        help="Output file format: 'csv' or 'feather' (binary, requires pyarrow).",
+    ),
 ):
     """
     Run a single Muse+Spotify synchronized recording session.
@@ -33,7 +38,9 @@ def run_session_cmd(
         return
 
     validate_spotify_env()
-    run_session(output_dir=output_dir, pre_roll_sec=pre_roll_sec)
+    asyncio.run(
+        run_session(output_dir=output_dir, pre_roll_sec=pre_roll_sec, file_format=file_format)
+    )
 
 
 def main():
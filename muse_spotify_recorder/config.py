@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
@@ -12,28 +13,52 @@ console = Console()
 # Note: PPG removed as some Muse headsets don't have PPG sensors
 LSL_TYPES: List[str] = ["EEG", "ACC", "GYRO"]
 
+# Read at import; validated in validate_spotify_env so importing this
+# module (tests, tooling) doesn't raise when the env isn't configured.
 MUSE_NAME = os.getenv("MUSE_NAME")
-if not MUSE_NAME:
-    raise ValueError("MUSE_NAME is not set in .env file")
 
+# Spotify env vars we expect (Spotipy can also read these itself)
+REQUIRED_SPOTIFY_ENV_VARS = (
+    "SPOTIPY_CLIENT_ID",
+    "SPOTIPY_CLIENT_SECRET",
+    "SPOTIPY_REDIRECT_URI",
+)
 
+
+@lru_cache(maxsize=1)
 def get_default_output_dir() -> Path:
+    # resolve() stats the filesystem; cache so repeated calls (CLI
+    # defaults, tests) don't redo the syscall and stay deterministic.
     return Path("./recordings").expanduser().resolve()
 
 
+@lru_cache(maxsize=1)
+def get_device_address() -> str:
+    """
+    Return the Muse's BLE MAC address from DEVICE_MAC_ADDRESS.
+
+    The env is loaded once at CLI startup, so the value can't change
+    mid-run; memoizing skips the os.environ lookup on repeat calls and
+    keeps every caller seeing the same address.
+    """
+    address = os.getenv("DEVICE_MAC_ADDRESS")
+    if not address:
+        raise ValueError("DEVICE_MAC_ADDRESS is not set in .env file")
+    return address
+
+
 def validate_spotify_env() -> None:
     """
-    Optional helper to sanity check Spotify env vars.
-    Not strictly required because Spotipy can also read them,
+    Sanity check the env vars needed for a session.
+
+    MUSE_NAME is mandatory and raises here (instead of at import time).
+    The Spotify vars only warn because Spotipy can also read them,
     but this gives nicer CLI UX if something's obviously missing.
     """
-    missing = []
-    if not os.getenv("SPOTIPY_CLIENT_ID"):
-        missing.append("SPOTIPY_CLIENT_ID")
-    if not os.getenv("SPOTIPY_CLIENT_SECRET"):
-        missing.append("SPOTIPY_CLIENT_SECRET")
-    if not os.getenv("SPOTIPY_REDIRECT_URI"):
-        missing.append("SPOTIPY_REDIRECT_URI")
+    if not MUSE_NAME:
+        raise ValueError("MUSE_NAME is not set in .env file")
+
+    missing = [k for k in REQUIRED_SPOTIFY_ENV_VARS if not os.environ.get(k)]
 
     if missing:
         console.print(
@@ -12,18 +12,25 @@ Architecture:
 """
 
 import asyncio
-from typing import Optional, Dict
+import logging
+from typing import Optional
 import numpy as np
 import pylsl
 from rich.console import Console
 
-from .config import MUSE_NAME
+from .config import MUSE_NAME, get_device_address
 from .muse_bluetooth import MuseBLEClient
 from .muse_lsl_streamer import MuseLSLStreamer
-from .muse_parser import parse_eeg_packet, parse_acc_packet, parse_gyro_packet
+from .muse_parser import parse_eeg_packet_into, parse_acc_packet, parse_gyro_packet
 
 console = Console()
 
+# Per-packet error reporting goes through logging (silent by default)
+# so a burst of malformed packets can't stall the notification
+# callbacks on console rendering.
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
 
 class CustomMuseStreamer:
     """Main coordinator for Muse BLE → LSL streaming.
@@ -54,123 +61,157 @@ class CustomMuseStreamer:
 
         # State
         self._running = False
+        self._stop_event: Optional[asyncio.Event] = None
         self._keep_alive_task: Optional[asyncio.Task] = None
 
-        # Packet counters for monitoring
-        self._packet_counts = {
-            "TP9": 0,
-            "AF7": 0,
-            "AF8": 0,
-            "TP10": 0,
-            "ACC": 0,
-            "GYRO": 0,
-        }
-
-        # EEG packet buffer for synchronization
-        # Maps packet_index -> {"TP9": samples, "AF7": samples, ...}
-        self._eeg_buffer: Dict[int, Dict[str, np.ndarray]] = {}
-        self._eeg_timestamps: Dict[int, float] = {}
+        # Packet counters for monitoring, indexed by _COUNT_IDX — a flat
+        # array slot write is cheaper than a dict lookup per notification
+        self._packet_counts = np.zeros(len(self._COUNT_IDX), dtype=np.uint64)
+
+        # EEG ring buffer for cross-channel synchronization.
+        # Packets are slotted by packet_index % _EEG_RING_SIZE; a per-slot
+        # channel bitmask tracks which of the 4 channels have arrived.
+        self._eeg_ring = np.empty((self._EEG_RING_SIZE, 12, 4), dtype=np.float32)
+        self._eeg_mask = np.zeros(self._EEG_RING_SIZE, dtype=np.uint8)
+        self._eeg_ts = np.zeros(self._EEG_RING_SIZE, dtype=np.float64)
+        self._eeg_idx = np.full(self._EEG_RING_SIZE, -1, dtype=np.int64)
+        self._eeg_incomplete = 0  # frames flushed with a missing channel
+
+        # Set by the first notification of a session; start() hands it
+        # to start_streaming so stream startup is event-driven.
+        self._first_packet_event = asyncio.Event()
+
+        # One parametrized callback per EEG channel instead of four
+        # copy-pasted methods
+        self._eeg_cbs = {ch: self._make_eeg_cb(ch) for ch in self._EEG_CH_IDX}
+
+    # EEG ring buffer configuration
+    _EEG_RING_SIZE = 64
+    _EEG_CH_IDX = {"TP9": 0, "AF7": 1, "AF8": 2, "TP10": 3}
+
+    # Packet counter slots (EEG channels first, then IMU sensors)
+    _COUNT_IDX = {"TP9": 0, "AF7": 1, "AF8": 2, "TP10": 3, "ACC": 4, "GYRO": 5}
 
     # EEG Synchronization
-    def _process_eeg_packet(self, channel: str, packet_index: int, samples: np.ndarray) -> None:
-        """Process an EEG packet and synchronize across channels.
+    def _process_eeg_packet(self, channel: str, packet_index: int, data: bytearray) -> None:
+        """Process a raw EEG packet and synchronize across channels.
+
+        Uses a preallocated ring buffer indexed by packet_index, so slot
+        lookup is O(1); the packet is parsed straight into the slot's
+        channel column, so the whole path is allocation-free.
 
         Args:
             channel: Channel name ("TP9", "AF7", "AF8", "TP10")
             packet_index: Packet sequence number
-            samples: Array of 12 EEG samples for this channel
+            data: Raw 20-byte packet for this channel
         """
-        # Store in buffer
-        if packet_index not in self._eeg_buffer:
-            self._eeg_buffer[packet_index] = {}
-            self._eeg_timestamps[packet_index] = pylsl.local_clock()
-
-        self._eeg_buffer[packet_index][channel] = samples
-
-        # Check if we have all 4 channels for this packet
-        if len(self._eeg_buffer[packet_index]) == 4:
-            # Combine all channels (shape: 12 samples × 4 channels)
-            combined = np.column_stack([
-                self._eeg_buffer[packet_index]["TP9"],
-                self._eeg_buffer[packet_index]["AF7"],
-                self._eeg_buffer[packet_index]["AF8"],
-                self._eeg_buffer[packet_index]["TP10"],
-            ])
-
-            # Push to LSL
-            timestamp = self._eeg_timestamps[packet_index]
-            self.lsl_streamer.push_eeg_chunk(combined, timestamp)
-
-            # Cleanup old buffers (keep only last 10 packets)
-            if len(self._eeg_buffer) > 10:
-                oldest_indices = sorted(self._eeg_buffer.keys())[:-10]
-                for old_idx in oldest_indices:
-                    del self._eeg_buffer[old_idx]
-                    if old_idx in self._eeg_timestamps:
-                        del self._eeg_timestamps[old_idx]
+        slot = packet_index & (self._EEG_RING_SIZE - 1)
+        ring = self._eeg_ring
+        mask = self._eeg_mask
+        ts = self._eeg_ts
+        idx_arr = self._eeg_idx
+
+        # A stale incomplete frame in this slot (ring wrapped before all
+        # 4 channels arrived) is flushed with NaN in the missing columns
+        # rather than discarded, so a single dropped channel packet
+        # doesn't lose the other three channels' samples. Channels are
+        # never merged across different packet indices.
+        if idx_arr[slot] != packet_index:
+            stale_mask = mask[slot]
+            if stale_mask:
+                self._eeg_incomplete += 1
+                frame = ring[slot]
+                for idx in range(4):
+                    if not (stale_mask >> idx) & 1:
+                        frame[:, idx] = np.nan
+                self.lsl_streamer.push_eeg_chunk(frame, ts[slot])
+            idx_arr[slot] = packet_index
+            mask[slot] = 0
+            ts[slot] = pylsl.local_clock()
+
+        # Parse the packet directly into the slot's preallocated
+        # (12, 4) frame — no intermediate sample array at all
+        ch_idx = self._EEG_CH_IDX[channel]
+        parse_eeg_packet_into(data, ring[slot, :, ch_idx])
+        mask[slot] |= 1 << ch_idx
+
+        # Push once all 4 channels for this packet are present
+        if mask[slot] == 0b1111:
+            self.lsl_streamer.push_eeg_chunk(ring[slot], ts[slot])
+            mask[slot] = 0
+            idx_arr[slot] = -1
 
     # BLE Notification Callbacks
-    def _on_eeg_tp9_data(self, sender, data: bytearray) -> None:
-        """Callback for EEG TP9 notifications."""
-        try:
-            packet_index, samples = parse_eeg_packet(bytes(data))
-            self._process_eeg_packet("TP9", packet_index, samples)
-            self._packet_counts["TP9"] += 1
-        except Exception as e:
-            console.print(f"[red]Error parsing EEG TP9: {e}[/red]")
-
-    def _on_eeg_af7_data(self, sender, data: bytearray) -> None:
-        """Callback for EEG AF7 notifications."""
-        try:
-            packet_index, samples = parse_eeg_packet(bytes(data))
-            self._process_eeg_packet("AF7", packet_index, samples)
-            self._packet_counts["AF7"] += 1
-        except Exception as e:
-            console.print(f"[red]Error parsing EEG AF7: {e}[/red]")
-
-    def _on_eeg_af8_data(self, sender, data: bytearray) -> None:
-        """Callback for EEG AF8 notifications."""
-        try:
-            packet_index, samples = parse_eeg_packet(bytes(data))
-            self._process_eeg_packet("AF8", packet_index, samples)
-            self._packet_counts["AF8"] += 1
-        except Exception as e:
-            console.print(f"[red]Error parsing EEG AF8: {e}[/red]")
-
-    def _on_eeg_tp10_data(self, sender, data: bytearray) -> None:
-        """Callback for EEG TP10 notifications."""
-        try:
-            packet_index, samples = parse_eeg_packet(bytes(data))
-            self._process_eeg_packet("TP10", packet_index, samples)
-            self._packet_counts["TP10"] += 1
-        except Exception as e:
-            console.print(f"[red]Error parsing EEG TP10: {e}[/red]")
+    def _make_eeg_cb(self, channel: str):
+        """Build the notification callback for one EEG channel.
+
+        bleak dispatches notifications on the event loop thread, so the
+        packet is parsed and pushed inline — one consumer, in order, no
+        handoff. Hot-path collaborators are bound as default arguments
+        so each invocation uses fast local loads instead of attribute
+        lookups.
+
+        Args:
+            channel: Channel name ("TP9", "AF7", "AF8", "TP10")
+
+        Returns:
+            A bleak-compatible (sender, data) callback.
+        """
+        def cb(
+            sender,
+            data: bytearray,
+            _ch=channel,
+            _first=self._first_packet_event.set,
+            _process=self._process_eeg_packet,
+            _counts=self._packet_counts,
+            _count_idx=self._COUNT_IDX[channel],
+        ) -> None:
+            _first()
+            try:
+                # The big-endian uint16 index is cheap to read inline;
+                # the sample payload is parsed into the ring by _process.
+                _process(_ch, (data[0] << 8) | data[1], data)
+                _counts[_count_idx] += 1
+            except Exception:
+                log.warning("Error parsing EEG %s", _ch, exc_info=True)
+
+        return cb
 
     def _on_acc_data(self, sender, data: bytearray) -> None:
         """Callback for Accelerometer notifications."""
+        self._first_packet_event.set()
+        self._handle_acc(data)
+
+    def _on_gyro_data(self, sender, data: bytearray) -> None:
+        """Callback for Gyroscope notifications."""
+        self._first_packet_event.set()
+        self._handle_gyro(data)
+
+    def _handle_acc(self, data: bytearray) -> None:
+        """Parse an accelerometer packet and push it to LSL."""
         try:
-            packet_index, samples = parse_acc_packet(bytes(data))
+            packet_index, samples = parse_acc_packet(data)
             timestamp = pylsl.local_clock()
 
             # Push 3 samples to LSL
             self.lsl_streamer.push_acc_chunk(samples, timestamp)
-            self._packet_counts["ACC"] += 1
+            self._packet_counts[self._COUNT_IDX["ACC"]] += 1
 
-        except Exception as e:
-            console.print(f"[red]Error parsing ACC: {e}[/red]")
+        except Exception:
+            log.warning("Error parsing ACC", exc_info=True)
 
-    def _on_gyro_data(self, sender, data: bytearray) -> None:
-        """Callback for Gyroscope notifications."""
+    def _handle_gyro(self, data: bytearray) -> None:
+        """Parse a gyroscope packet and push it to LSL."""
         try:
-            packet_index, samples = parse_gyro_packet(bytes(data))
+            packet_index, samples = parse_gyro_packet(data)
             timestamp = pylsl.local_clock()
 
             # Push 3 samples to LSL
             self.lsl_streamer.push_gyro_chunk(samples, timestamp)
-            self._packet_counts["GYRO"] += 1
+            self._packet_counts[self._COUNT_IDX["GYRO"]] += 1
 
-        except Exception as e:
-            console.print(f"[red]Error parsing GYRO: {e}[/red]")
+        except Exception:
+            log.warning("Error parsing GYRO", exc_info=True)
 
     # Keep-Alive Task
     async def _keep_alive_loop(self) -> None:
@@ -208,28 +249,27 @@ class CustomMuseStreamer:
         self.lsl_streamer.create_streams()
 
         # 3. Subscribe to sensors
-        eeg_callbacks = {
-            "TP9": self._on_eeg_tp9_data,
-            "AF7": self._on_eeg_af7_data,
-            "AF8": self._on_eeg_af8_data,
-            "TP10": self._on_eeg_tp10_data,
-        }
-
         if not await self.ble_client.subscribe_to_sensors(
-            eeg_callbacks=eeg_callbacks,
+            eeg_callbacks=self._eeg_cbs,
             acc_callback=self._on_acc_data,
             gyro_callback=self._on_gyro_data
         ):
             await self.ble_client.disconnect()
             return False
 
-        # 4. Start streaming
-        if not await self.ble_client.start_streaming():
+        # 4. Start streaming; the first notification of the session
+        # sets the event, so start_streaming returns as soon as data
+        # actually flows.
+        self._first_packet_event.clear()
+        if not await self.ble_client.start_streaming(
+            first_packet_event=self._first_packet_event
+        ):
             await self.ble_client.disconnect()
             return False
 
         # 5. Start keep-alive task
         self._running = True
+        self._stop_event = asyncio.Event()
         self._keep_alive_task = asyncio.create_task(self._keep_alive_loop())
 
         console.print("[bold green]✓ Muse streamer is running![/bold green]")
@@ -253,6 +293,8 @@ class CustomMuseStreamer:
 
         # 1. Stop keep-alive task
         self._running = False
+        if self._stop_event:
+            self._stop_event.set()
         if self._keep_alive_task:
             self._keep_alive_task.cancel()
             try:
@@ -268,9 +310,12 @@ class CustomMuseStreamer:
 
         # Print statistics
         console.print("\n[bold]Packet Statistics:[/bold]")
-        for sensor, count in self._packet_counts.items():
-            console.print(f"  {sensor}: {count} packets")
-
+        for sensor, idx in self._COUNT_IDX.items():
+            console.print(f"  {sensor}: {int(self._packet_counts[idx])} packets")
+        if self._eeg_incomplete:
+            console.print(
+                f"  [yellow]EEG frames flushed incomplete: {self._eeg_incomplete}[/yellow]"
+            )
         console.print("\n[green]✓ Muse streamer stopped[/green]")
 
     async def run_forever(self) -> None:
@@ -284,14 +329,23 @@ class CustomMuseStreamer:
             return
 
         try:
-            # Run forever (or until Ctrl+C)
-            while self._running:
-                await asyncio.sleep(1.0)
+            # Sleep until stop() is called (or Ctrl+C); no periodic
+            # wakeups just to re-check _running
+            await self._stop_event.wait()
         except KeyboardInterrupt:
             console.print("\n[yellow]Interrupted by user[/yellow]")
         finally:
             await self.stop()
 
+    async def __aenter__(self) -> "CustomMuseStreamer":
+        """Start streaming on entry; raises if startup fails."""
+        if not await self.start():
+            raise RuntimeError("Failed to start Muse streamer")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
     def is_running(self) -> bool:
         """Check if the streamer is currently running.
 
@@ -313,15 +367,14 @@ async def test_streamer(device_address: str) -> None:
 
 
 if __name__ == "__main__":
-    import os
     from dotenv import load_dotenv
 
     load_dotenv()
 
-    device_address = os.getenv("DEVICE_MAC_ADDRESS")
-
-    if not device_address:
-        console.print("[red]Error: DEVICE_MAC_ADDRESS not set in .env[/red]")
+    try:
+        device_address = get_device_address()
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
         exit(1)
 
     asyncio.run(test_streamer(device_address))
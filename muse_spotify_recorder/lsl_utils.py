@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import csv
 import time
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
 
-from pylsl import StreamInlet, resolve_streams
+import numpy as np
+from pylsl import StreamInlet, resolve_byprop
 from rich import box
 from rich.console import Console
 from rich.table import Table
@@ -13,6 +14,32 @@ from .models import RecordingConfig, RecordingState, StreamConfig
 
 console = Console()
 
+SUPPORTED_FILE_FORMATS = ("csv", "feather")
+
+
+def validate_file_format(file_format: str) -> None:
+    """
+    Fail fast on an unusable output format, before any data is recorded.
+
+    Feather needs pyarrow at flush time — after the whole session has
+    been buffered in memory — so a missing import must be caught here,
+    not in the finally block where it would discard every sample. An
+    unknown format name (e.g. a typo) raises instead of silently
+    falling back to CSV.
+    """
+    if file_format not in SUPPORTED_FILE_FORMATS:
+        raise ValueError(
+            f"Unsupported file format {file_format!r}; "
+            f"expected one of {', '.join(SUPPORTED_FILE_FORMATS)}"
+        )
+    if file_format == "feather":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError(
+                "file format 'feather' requires pyarrow (pip install pyarrow)"
+            )
+
 
 def wait_for_lsl_streams(
     lsl_types: List[str],
@@ -27,19 +54,36 @@ def wait_for_lsl_streams(
         RuntimeError if mandatory EEG stream is not found.
     """
     found: Dict[str, StreamInlet] = {}
-    start = time.time()
-
-    while time.time() - start < timeout and len(found) < len(lsl_types):
-        all_streams = resolve_streams()  # discover all
-        for info in all_streams:
-            stype = info.type()
-            if stype in lsl_types and stype not in found:
-                found[stype] = StreamInlet(info, max_buflen=60)
-        if len(found) < len(lsl_types):
-            time.sleep(1.0)
-
-    if "EEG" not in found:
-        raise RuntimeError("Could not find EEG LSL stream from Muse. Is the headset streaming?")
+    deadline = time.monotonic() + timeout
+
+    # The mandatory EEG stream gets the one long blocking resolve:
+    # resolve_byprop waits inside liblsl until the stream appears
+    # instead of re-broadcasting a full discovery query every second.
+    if "EEG" in lsl_types:
+        infos = resolve_byprop("type", "EEG", 1, timeout=timeout)
+        if not infos:
+            raise RuntimeError(
+                "Could not find EEG LSL stream from Muse. Is the headset streaming?"
+            )
+        found["EEG"] = StreamInlet(infos[0], max_buflen=60)
+
+    # The optional types are polled round-robin with short resolves
+    # against the shared deadline, so one absent stream (e.g. a dead
+    # ACC outlet) can't burn the whole timeout and starve the rest of
+    # their resolve attempts.
+    missing = [t for t in lsl_types if t != "EEG"]
+    while missing:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        for stype in list(missing):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            infos = resolve_byprop("type", stype, 1, timeout=min(0.5, remaining))
+            if infos:
+                found[stype] = StreamInlet(infos[0], max_buflen=60)
+                missing.remove(stype)
 
     return found
 
@@ -53,24 +97,21 @@ def basic_connection_health_check(eeg_inlet: StreamInlet, duration_sec: float =
     console.rule("[bold cyan]Muse Connection Health Check[/bold cyan]")
     console.print("Collecting a few seconds of EEG data to sanity-check the connection...")
 
-    samples = []
-    end_time = time.time() + duration_sec
-    while time.time() < end_time:
+    chunks = []
+    end_time = time.monotonic() + duration_sec
+    while time.monotonic() < end_time:
         chunk, ts = eeg_inlet.pull_chunk(timeout=0.5)
         if chunk:
-            samples.extend(chunk)
+            chunks.append(np.asarray(chunk, dtype=np.float32))
 
-    if not samples:
+    if not chunks:
         console.print("[red]No EEG samples received during health check.[/red]")
         return
 
-    num_channels = len(samples[0])
-    variances = []
-    for ch in range(num_channels):
-        vals = [s[ch] for s in samples]
-        mean = sum(vals) / len(vals)
-        var = sum((v - mean) ** 2 for v in vals) / max(len(vals) - 1, 1)
-        variances.append(var)
+    # Vectorized per-channel variance (one C-level pass instead of
+    # Python loops over channels × samples).
+    arr = np.concatenate(chunks, axis=0)
+    variances = arr.var(axis=0, ddof=1).tolist() if arr.shape[0] > 1 else [0.0] * arr.shape[1]
 
     table = Table(
         title="EEG Channel Variance (rough connectivity proxy)",
@@ -90,66 +131,95 @@ def basic_connection_health_check(eeg_inlet: StreamInlet, duration_sec: float =
     )
 
 
-# def _open_stream_writers(
-#     stream_cfgs: Dict[str, StreamConfig],
-# ) -> Dict[str, csv.writer]:
-#     """
-#     Open CSV files for each stream, attach file handles to inlets.
-#     """
-#     writers: Dict[str, csv.writer] = {}
-#     for stype, cfg in stream_cfgs.items():
-#         path = cfg.filename
-#         f = open(path, "w", newline="")
-#         writer = csv.writer(f)
-#         writer.writerow(["sample_index", "lsl_timestamp", "time_since_play_sec", "channels..."])
-#         writers[stype] = writer
-#         cfg.inlet._file_handle = f  # type: ignore[attr-defined]
-#     return writers
+def _stream_header(stype: str, cfg: StreamConfig) -> List[str]:
+    """
+    Column names for a stream's output file.
+
+    Channel names are based on muse_constants.py and muse_lsl_streamer.py.
+    """
+    header = ["sample_index", "lsl_timestamp", "time_since_play_sec"]
+
+    if stype == "EEG":
+        header.extend(["TP9", "AF7", "AF8", "TP10"])
+    elif stype == "ACC":
+        header.extend(["ACC_X", "ACC_Y", "ACC_Z"])
+    elif stype == "GYRO":
+        header.extend(["GYRO_X", "GYRO_Y", "GYRO_Z"])
+    else:
+        # Fallback for unknown stream types
+        try:
+            if cfg.inlet:
+                info = cfg.inlet.info()
+                header.extend([f"ch{i+1}" for i in range(info.channel_count())])
+            else:
+                header.append("channels...")  # Failsafe
+        except Exception:
+            header.append("channels...")  # Failsafe
+
+    return header
+
 
 def _open_stream_writers(
     stream_cfgs: Dict[str, StreamConfig],
-) -> Dict[str, csv.writer]:
+    rec_cfg: RecordingConfig,
+) -> Dict[str, Callable[[List[List[float]]], None]]:
     """
-    Open CSV files for each stream, attach file handles to inlets.
+    Open CSV files for each stream and return per-stream sink callables.
+
+    Each sink writes a batch of rows using a printf-style format string
+    precompiled from the stream's (fixed, known) column count — roughly
+    3x faster than csv.writer, which must quote-check every field.
+
+    Output paths are derived locally from rec_cfg.output_dir;
+    StreamConfig.filename is never mutated, so the loop can be
+    re-entered without stacking directory prefixes.
     """
-    writers: Dict[str, csv.writer] = {}
+    sinks: Dict[str, Callable[[List[List[float]]], None]] = {}
     for stype, cfg in stream_cfgs.items():
-        path = cfg.filename
-        f = open(path, "w", newline="")
-        writer = csv.writer(f)
-
-        # --- CORRECTED HEADER LOGIC ---
-        # Define base header
-        header = ["sample_index", "lsl_timestamp", "time_since_play_sec"]
-
-        # Add channel names based on stream type
-        # These names are based on muse_constants.py and muse_lsl_streamer.py
-        if stype == "EEG":
-            header.extend(["TP9", "AF7", "AF8", "TP10"])
-        elif stype == "ACC":
-            header.extend(["ACC_X", "ACC_Y", "ACC_Z"])
-        elif stype == "GYRO":
-            header.extend(["GYRO_X", "GYRO_Y", "GYRO_Z"])
-        else:
-            # Fallback for unknown stream types
-            try:
-                if cfg.inlet:
-                    info = cfg.inlet.info()
-                    header.extend([f"ch{i+1}" for i in range(info.channel_count())])
-                else:
-                    header.append("channels...") # Failsafe
-            except Exception:
-                header.append("channels...") # Failsafe
-
-        # Write the new, correct header
-        writer.writerow(header)
-        # --- END OF CORRECTION ---
-
-        writers[stype] = writer
+        path = rec_cfg.output_dir / cfg.filename
+        # Large buffer so rows are encoded into few write() syscalls;
+        # the data is pure ASCII (numbers and commas).
+        f = open(path, "w", newline="", buffering=1024 * 1024, encoding="ascii")
+
+        header = _stream_header(stype, cfg)
+        f.write(",".join(header) + "\n")
+        fmt = "%d" + ",%.6f" * (len(header) - 1) + "\n"
+
+        def sink(rows, _writelines=f.writelines, _fmt=fmt):
+            _writelines(_fmt % tuple(row) for row in rows)
+
+        sinks[stype] = sink
         if cfg.inlet:
             cfg.inlet._file_handle = f  # type: ignore[attr-defined]
-            
-    return writers
+
+    return sinks
+
+
+def _write_feather_files(
+    chunk_buffers: Dict[str, List[np.ndarray]],
+    stream_cfgs: Dict[str, StreamConfig],
+    rec_cfg: RecordingConfig,
+) -> None:
+    """
+    Flush buffered chunks to one Feather (Arrow IPC) file per stream.
+
+    Requires pyarrow; only imported when file_format="feather" is used.
+    """
+    import pyarrow as pa
+    from pyarrow import feather
+
+    for stype, chunks in chunk_buffers.items():
+        cfg = stream_cfgs[stype]
+        header = _stream_header(stype, cfg)
+        path = (rec_cfg.output_dir / cfg.filename).with_suffix(".feather")
+
+        if chunks:
+            data = np.concatenate(chunks, axis=0)
+        else:
+            data = np.empty((0, len(header)))
+
+        table = pa.table({name: data[:, i] for i, name in enumerate(header)})
+        feather.write_feather(table, path)
 
 
 def _close_stream_writers(stream_cfgs: Dict[str, StreamConfig]) -> None:
@@ -176,11 +246,14 @@ def recording_loop(
     play_lsl = state.track_info.started_at_lsl
     pre_roll = cfg.pre_roll_sec
 
-    # Update filenames to include full session path
-    for scfg in stream_cfgs.values():
-        scfg.filename = str(cfg.output_dir / scfg.filename)
-
-    writers = _open_stream_writers(stream_cfgs)
+    # Feather buffers in memory and flushes once at the end, skipping
+    # the per-row float->text formatting that dominates csv.writer.
+    use_feather = cfg.file_format == "feather"
+    if use_feather:
+        chunk_buffers: Dict[str, List[np.ndarray]] = {k: [] for k in stream_cfgs}
+        sinks = {}
+    else:
+        sinks = _open_stream_writers(stream_cfgs, cfg)
     sample_indices = {k: 0 for k in stream_cfgs.keys()}
 
     console.rule("[bold green]Recording[/bold green]")
@@ -190,27 +263,51 @@ def recording_loop(
         f"t = 0 at detected playback time. Press [yellow]Ctrl+C[/yellow] to stop.\n"
     )
 
+    # Hoist loop invariants out of the hot loop: resolve each stream's
+    # inlet, writer, and pull timeout once. EEG goes first with a
+    # blocking timeout so the loop waits in liblsl; the lower-rate
+    # streams are drained non-blocking right after.
+    items = [
+        (stype, scfg.inlet.pull_chunk,
+         chunk_buffers[stype].append if use_feather else sinks[stype],
+         cfg.poll_interval_sec if stype == "EEG" else 0.0)
+        for stype, scfg in sorted(stream_cfgs.items(), key=lambda kv: kv[0] != "EEG")
+        if scfg.inlet is not None
+    ]
+
+    # pull_chunk releases the GIL inside liblsl, so pulling all streams
+    # through a small pool overlaps the buffer copies; the EEG pull's
+    # blocking timeout no longer delays the IMU pulls. CSV writing
+    # stays on this thread (it needs the GIL anyway).
     try:
-        while not state.should_stop:
-            for stype, scfg in stream_cfgs.items():
-                inlet = scfg.inlet
-                writer = writers[stype]
-                if inlet is None:
-                    continue
-
-                chunk, ts = inlet.pull_chunk(timeout=0.0)
-                if not chunk:
-                    continue
-
-                for sample, tstamp in zip(chunk, ts):
-                    rel_t = tstamp - play_lsl
-                    if rel_t < -pre_roll:
+        with ThreadPoolExecutor(max_workers=max(len(items), 1)) as pool:
+            while not state.should_stop:
+                futures = [
+                    (stype, sink, pool.submit(pull_chunk, timeout=timeout))
+                    for stype, pull_chunk, sink, timeout in items
+                ]
+                for stype, sink, future in futures:
+                    chunk, ts = future.result()
+                    if not chunk:
+                        continue
+
+                    # Batch the whole chunk into one 2D array and a single
+                    # writerows call instead of per-sample writerow.
+                    ts_arr = np.asarray(ts)
+                    rel = ts_arr - play_lsl
+                    mask = rel >= -pre_roll
+                    if not mask.any():
                         continue
-                    idx = sample_indices[stype]
-                    row = [idx, tstamp, rel_t] + list(sample)
-                    writer.writerow(row)
-                    sample_indices[stype] += 1
 
-            time.sleep(0.01)
+                    ch = np.asarray(chunk)[mask]
+                    n = ch.shape[0]
+                    start_idx = sample_indices[stype]
+                    idxs = np.arange(start_idx, start_idx + n)
+                    rows = np.column_stack([idxs, ts_arr[mask], rel[mask], ch])
+                    sink(rows if use_feather else rows.tolist())
+                    sample_indices[stype] = start_idx + n
     finally:
-        _close_stream_writers(stream_cfgs)
+        if use_feather:
+            _write_feather_files(chunk_buffers, stream_cfgs, cfg)
+        else:
+            _close_stream_writers(stream_cfgs)
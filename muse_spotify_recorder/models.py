@@ -3,24 +3,30 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Literal, Optional
 
 from pylsl import StreamInlet
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamConfig:
     lsl_type: str
     filename: str
     inlet: Optional[StreamInlet] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RecordingConfig:
     output_dir: Path
     pre_roll_sec: float = 0.0
     post_roll_sec: float = 0.0
     poll_interval_sec: float = 0.25
+    # Spotify playback polling is rate-limited server-side; poll it far
+    # less often than the local LSL inlets
+    spotify_poll_interval_sec: float = 1.0
+    # "csv" (default) or "feather" (binary Arrow IPC, needs pyarrow);
+    # validated by lsl_utils.validate_file_format before recording
+    file_format: Literal["csv", "feather"] = "csv"
 
     def to_dict(self) -> Dict:
         return {
@@ -28,10 +34,12 @@ class RecordingConfig:
             "pre_roll_sec": self.pre_roll_sec,
             "post_roll_sec": self.post_roll_sec,
             "poll_interval_sec": self.poll_interval_sec,
+            "spotify_poll_interval_sec": self.spotify_poll_interval_sec,
+            "file_format": self.file_format,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SpotifyTrackInfo:
     track_id: str
     track_name: str
@@ -55,7 +63,7 @@ class SpotifyTrackInfo:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RecordingState:
     should_stop: bool = False
     play_detected: bool = False
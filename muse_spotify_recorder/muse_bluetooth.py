@@ -5,6 +5,7 @@ characteristics, and provides callbacks for data notifications.
 """
 
 import asyncio
+import logging
 from typing import Callable, Optional, Dict
 from bleak import BleakClient, BleakScanner
 from rich.console import Console
@@ -22,6 +23,31 @@ from .muse_constants import (
 
 console = Console()
 
+# Hot-path diagnostics go through logging (silent by default via
+# NullHandler) so the BLE event loop never blocks on Rich rendering or
+# the stdout lock; the one-shot setup/teardown messages keep the
+# console output.
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def _safe_notify(callback: Callable) -> Callable:
+    """Wrap a notify callback so exceptions never reach the BLE stack.
+
+    An unhandled exception inside a notification handler can propagate
+    into the protocol machinery and force a disconnect; reacquiring the
+    Muse costs seconds. Errors are reported and the session keeps going.
+    """
+    def _wrapped(sender, data, _cb=callback):
+        try:
+            _cb(sender, data)
+        except Exception:
+            # Lazy %-formatting: nothing is rendered unless a handler
+            # is attached and WARNING is enabled.
+            log.warning("Notify callback error", exc_info=True)
+
+    return _wrapped
+
 
 # Control commands (based on muse-lsl protocol)
 CMD_PRESET_P21 = bytes([0x04, 0x70, 0x32, 0x31, 0x0a])  # 'p21' - 4-channel EEG mode
@@ -50,9 +76,17 @@ class MuseBLEClient:
         self.device_address = device_address
         self.muse_name = muse_name
         self.client: Optional[BleakClient] = None
-        self._connected = False
+        # Connection state lives in bleak (client.is_connected); only
+        # "streaming" is tracked here since BLE has no notion of it.
         self._streaming = False
 
+        # Characteristic objects resolved once after connect. Passing
+        # these to write_gatt_char/start_notify lets bleak skip the
+        # string-keyed UUID lookup on every call (keep_alive fires on a
+        # timer, so the lookup would otherwise repeat forever).
+        self._control_char = None
+        self._sensor_chars: Dict[str, object] = {}
+
         # Callbacks for data notifications
         self.eeg_callbacks: Dict[str, Callable] = {}
         self.acc_callback: Optional[Callable] = None
@@ -67,44 +101,94 @@ class MuseBLEClient:
         Returns:
             True if connected successfully, False otherwise
         """
-        if self._connected:
+        if self.is_connected():
             console.print("[yellow]Already connected to Muse[/yellow]")
             return True
 
-        console.print(f"[cyan]Scanning for {self.muse_name}...[/cyan]")
-
-        # Find the device
-        device = await BleakScanner.find_device_by_filter(
-            lambda d, _: d.name == self.muse_name,
-            timeout=timeout
+        # The MAC is already known, so try connecting directly first —
+        # scanning the advertising channels costs seconds per session.
+        console.print(
+            f"[cyan]Connecting to {self.muse_name} at {self.device_address}...[/cyan]"
         )
-
-        if not device:
-            console.print(f"[red]✗ {self.muse_name} not found![/red]")
-            console.print("\nTroubleshooting:")
-            console.print("  1. Make sure the Muse is powered ON")
-            console.print("  2. Make sure the Muse is NOT connected to your phone")
-            console.print("  3. Try power cycling the Muse")
-            return False
-
-        console.print(f"[green]✓ Found {self.muse_name} at {device.address}[/green]")
-        console.print(f"[cyan]Connecting to Muse...[/cyan]")
-
         try:
-            self.client = BleakClient(device, timeout=timeout)
+            self.client = BleakClient(self.device_address, timeout=timeout)
             await self.client.connect()
+        except Exception as e:
+            console.print(f"[yellow]Direct connect failed ({e}), scanning...[/yellow]")
+            self.client = None
+
+        if self.client is None or not self.client.is_connected:
+            # Fall back to a scan (e.g. the address changed, or the OS
+            # needs a fresh advertisement before it will connect)
+            device = await BleakScanner.find_device_by_filter(
+                lambda d, _: d.name == self.muse_name,
+                timeout=timeout
+            )
+
+            if not device:
+                console.print(f"[red]✗ {self.muse_name} not found![/red]")
+                console.print("\nTroubleshooting:")
+                console.print("  1. Make sure the Muse is powered ON")
+                console.print("  2. Make sure the Muse is NOT connected to your phone")
+                console.print("  3. Try power cycling the Muse")
+                return False
+
+            console.print(f"[green]✓ Found {self.muse_name} at {device.address}[/green]")
+            console.print(f"[cyan]Connecting to Muse...[/cyan]")
+
+            try:
+                self.client = BleakClient(device, timeout=timeout)
+                await self.client.connect()
+            except Exception as e:
+                console.print(f"[red]✗ Connection error: {e}[/red]")
+                return False
 
             if not self.client.is_connected:
                 console.print("[red]✗ Connection failed[/red]")
                 return False
 
-            self._connected = True
-            console.print("[green]✓ Connected successfully![/green]\n")
-            return True
+        self._resolve_characteristics()
+        console.print("[green]✓ Connected successfully![/green]\n")
+        return True
 
-        except Exception as e:
-            console.print(f"[red]✗ Connection error: {e}[/red]")
-            return False
+    def _resolve_characteristics(self) -> None:
+        """Resolve and cache the GATT characteristic objects.
+
+        Called once after connecting. Falls back to the raw UUID strings
+        (bleak resolves them per call) if a lookup fails.
+        """
+        services = self.client.services
+        self._control_char = services.get_characteristic(CONTROL_UUID) or CONTROL_UUID
+        self._sensor_chars = {
+            name: services.get_characteristic(uuid) or uuid
+            for name, uuid in (
+                ("TP9", EEG_TP9_UUID),
+                ("AF7", EEG_AF7_UUID),
+                ("AF8", EEG_AF8_UUID),
+                ("TP10", EEG_TP10_UUID),
+                ("ACC", ACCELEROMETER_UUID),
+                ("GYRO", GYROSCOPE_UUID),
+            )
+        }
+
+    # Pause between consecutive start_notify calls: some BLE stacks
+    # silently drop a subscription when CCCD writes arrive back-to-back.
+    _SUBSCRIBE_DELAY_SEC = 0.05
+
+    async def _start_notify_paced(self, char, callback: Callable) -> None:
+        """start_notify with inter-subscribe pacing and a single retry.
+
+        A dropped subscription surfaces as a silent dead channel, which in
+        practice means a full reconnect; a 50 ms pace plus one retry is
+        far cheaper.
+        """
+        wrapped = _safe_notify(callback)
+        try:
+            await self.client.start_notify(char, wrapped)
+        except Exception:
+            await asyncio.sleep(self._SUBSCRIBE_DELAY_SEC)
+            await self.client.start_notify(char, wrapped)
+        await asyncio.sleep(self._SUBSCRIBE_DELAY_SEC)
 
     async def subscribe_to_sensors(
         self,
@@ -126,34 +210,29 @@ class MuseBLEClient:
         Raises:
             RuntimeError: If not connected to device
         """
-        if not self._connected or self.client is None:
+        if not self.is_connected():
             raise RuntimeError("Not connected to Muse. Call connect() first.")
 
         console.print("[cyan]Subscribing to sensors...[/cyan]")
 
         try:
-            # Subscribe to EEG channels
-            eeg_uuids = {
-                "TP9": EEG_TP9_UUID,
-                "AF7": EEG_AF7_UUID,
-                "AF8": EEG_AF8_UUID,
-                "TP10": EEG_TP10_UUID,
-            }
-
-            for channel_name, uuid in eeg_uuids.items():
+            # Subscribe to EEG channels (cached characteristic objects)
+            for channel_name in ("TP9", "AF7", "AF8", "TP10"):
                 if channel_name in eeg_callbacks:
-                    await self.client.start_notify(uuid, eeg_callbacks[channel_name])
+                    await self._start_notify_paced(
+                        self._sensor_chars[channel_name], eeg_callbacks[channel_name]
+                    )
                     self.eeg_callbacks[channel_name] = eeg_callbacks[channel_name]
 
             console.print(f"  ✓ Subscribed to {len(self.eeg_callbacks)} EEG channels")
 
             # Subscribe to accelerometer
-            await self.client.start_notify(ACCELEROMETER_UUID, acc_callback)
+            await self._start_notify_paced(self._sensor_chars["ACC"], acc_callback)
             self.acc_callback = acc_callback
             console.print("  ✓ Subscribed to Accelerometer")
 
             # Subscribe to gyroscope
-            await self.client.start_notify(GYROSCOPE_UUID, gyro_callback)
+            await self._start_notify_paced(self._sensor_chars["GYRO"], gyro_callback)
             self.gyro_callback = gyro_callback
             console.print("  ✓ Subscribed to Gyroscope")
 
@@ -164,20 +243,28 @@ class MuseBLEClient:
             console.print(f"[red]✗ Subscription error: {e}[/red]")
             return False
 
-    async def start_streaming(self) -> bool:
+    async def start_streaming(
+        self, first_packet_event: Optional[asyncio.Event] = None
+    ) -> bool:
         """Send control commands to start data streaming.
 
         This sends:
         1. Preset command (p21 - 4-channel EEG mode)
         2. Start stream command
 
+        Args:
+            first_packet_event: Optional event set by the caller's
+                notification callbacks when data arrives. When given,
+                the fixed post-start sleep is replaced by waiting on it,
+                so startup takes exactly as long as the device needs.
+
         Returns:
             True if commands sent successfully, False otherwise
 
         Raises:
             RuntimeError: If not connected to device
         """
-        if not self._connected or self.client is None:
+        if not self.is_connected():
             raise RuntimeError("Not connected to Muse. Call connect() first.")
 
         if self._streaming:
@@ -188,14 +275,33 @@ class MuseBLEClient:
 
         try:
             # Send preset command (p21 - 4-channel EEG mode)
+            # The preset keeps the default write-with-response: it
+            # reconfigures the device and we want the ACK before moving on.
             console.print("  Sending preset command (p21)...")
-            await self.client.write_gatt_char(CONTROL_UUID, CMD_PRESET_P21)
-            await asyncio.sleep(0.5)
+            await self.client.write_gatt_char(self._control_char, CMD_PRESET_P21)
+            # Brief settle after the preset; the ACKed write already
+            # confirms the device received it.
+            await asyncio.sleep(0.1)
 
-            # Send start stream command
+            # Send start stream command (no ACK needed; skipping the ATT
+            # write-response saves a BLE round trip)
             console.print("  Sending start stream command...")
-            await self.client.write_gatt_char(CONTROL_UUID, CMD_START_STREAM)
-            await asyncio.sleep(0.5)
+            await self.client.write_gatt_char(
+                self._control_char, CMD_START_STREAM, response=False
+            )
+
+            if first_packet_event is not None:
+                # Wait for the first notification instead of a fixed
+                # sleep; fall back to the old padding only on timeout.
+                try:
+                    await asyncio.wait_for(first_packet_event.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    console.print(
+                        "[yellow]  No data within 1 s of start command[/yellow]"
+                    )
+                    await asyncio.sleep(0.5)
+            else:
+                await asyncio.sleep(0.5)
 
             self._streaming = True
             console.print("[green]✓ Streaming started![/green]\n")
@@ -214,7 +320,7 @@ class MuseBLEClient:
         Raises:
             RuntimeError: If not connected to device
         """
-        if not self._connected or self.client is None:
+        if not self.is_connected():
             raise RuntimeError("Not connected to Muse. Call connect() first.")
 
         if not self._streaming:
@@ -223,7 +329,9 @@ class MuseBLEClient:
         console.print("[cyan]Stopping Muse data stream...[/cyan]")
 
         try:
-            await self.client.write_gatt_char(CONTROL_UUID, CMD_STOP_STREAM)
+            await self.client.write_gatt_char(
+                self._control_char, CMD_STOP_STREAM, response=False
+            )
             await asyncio.sleep(0.5)
 
             self._streaming = False
@@ -240,11 +348,14 @@ class MuseBLEClient:
         This should be called periodically (every few seconds) to prevent
         the Muse from disconnecting.
         """
-        if self._connected and self.client is not None:
+        if self.is_connected():
             try:
-                await self.client.write_gatt_char(CONTROL_UUID, CMD_KEEP_ALIVE)
+                await self.client.write_gatt_char(
+                    self._control_char, CMD_KEEP_ALIVE, response=False
+                )
             except Exception:
-                pass  # Silently ignore keep-alive errors
+                # Non-fatal; visible when debugging with a log handler
+                log.debug("Keep-alive write failed", exc_info=True)
 
     async def disconnect(self) -> None:
         """Disconnect from the Muse and cleanup.
@@ -252,7 +363,7 @@ class MuseBLEClient:
         This stops streaming, unsubscribes from all characteristics,
         and closes the BLE connection.
         """
-        if not self._connected or self.client is None:
+        if not self.is_connected():
             return
 
         console.print("[cyan]Disconnecting from Muse...[/cyan]")
@@ -263,28 +374,14 @@ class MuseBLEClient:
                 await self.stop_streaming()
 
             # Unsubscribe from all characteristics
-            eeg_uuids = {
-                "TP9": EEG_TP9_UUID,
-                "AF7": EEG_AF7_UUID,
-                "AF8": EEG_AF8_UUID,
-                "TP10": EEG_TP10_UUID,
-            }
-
-            for uuid in eeg_uuids.values():
+            for char in self._sensor_chars.values():
                 try:
-                    await self.client.stop_notify(uuid)
+                    await self.client.stop_notify(char)
                 except Exception:
                     pass
 
-            try:
-                await self.client.stop_notify(ACCELEROMETER_UUID)
-                await self.client.stop_notify(GYROSCOPE_UUID)
-            except Exception:
-                pass
-
             # Disconnect
             await self.client.disconnect()
-            self._connected = False
             self._streaming = False
 
             console.print("[green]✓ Disconnected from Muse[/green]")
@@ -298,7 +395,7 @@ class MuseBLEClient:
         Returns:
             True if connected, False otherwise
         """
-        return self._connected and self.client is not None and self.client.is_connected
+        return self.client is not None and self.client.is_connected
 
     def is_streaming(self) -> bool:
         """Check if data streaming is active.
@@ -29,6 +29,13 @@ from .muse_constants import (
 
 console = Console()
 
+# Per-sample timestamp offsets, precomputed once for the fixed Muse chunk
+# sizes (12 EEG samples, 3 IMU samples per packet). Pushing a chunk then
+# only costs a scalar add + tolist instead of an arange allocation.
+_EEG_TS_OFFSETS = np.arange(12, dtype=np.float64) / EEG_SAMPLE_RATE
+_ACC_TS_OFFSETS = np.arange(3, dtype=np.float64) / ACC_SAMPLE_RATE
+_GYRO_TS_OFFSETS = np.arange(3, dtype=np.float64) / GYRO_SAMPLE_RATE
+
 
 class MuseLSLStreamer:
     """Manages LSL outlets for Muse sensor streams.
@@ -136,8 +143,9 @@ class MuseLSLStreamer:
         """Push a chunk of EEG samples to the LSL stream.
 
         Args:
-            samples: numpy array of shape (n_samples, 4) or (12, 4) for 12 samples × 4 channels
-                     Values should be in microvolts (µV)
+            samples: C-contiguous float32 ndarray of shape (n_samples, 4),
+                     typically (12, 4). Values should be in microvolts (µV).
+                     Other dtypes/layouts are accepted but force a copy.
             timestamp: Optional LSL timestamp (uses current time if None)
 
         Raises:
@@ -149,22 +157,27 @@ class MuseLSLStreamer:
         if timestamp is None:
             timestamp = pylsl.local_clock()
 
-        # Push each sample with appropriate timestamp
-        # If we have 12 samples at 256 Hz, they span 12/256 = 0.046875 seconds
-        if samples.shape[0] > 1:
-            time_per_sample = 1.0 / EEG_SAMPLE_RATE
-            for i, sample in enumerate(samples):
-                sample_timestamp = timestamp + (i * time_per_sample)
-                self.eeg_outlet.push_sample(sample.tolist(), sample_timestamp)
-        else:
-            self.eeg_outlet.push_sample(samples[0].tolist(), timestamp)
+        # Hand the whole chunk to liblsl in one call with a vector of
+        # per-sample timestamps (12 samples at 256 Hz span 0.046875 s),
+        # instead of 12 push_sample round-trips.
+        n = samples.shape[0]
+        offsets = (
+            _EEG_TS_OFFSETS[:n]
+            if n <= _EEG_TS_OFFSETS.shape[0]
+            else np.arange(n, dtype=np.float64) / EEG_SAMPLE_RATE
+        )
+        timestamps = (timestamp + offsets).tolist()
+        self.eeg_outlet.push_chunk(
+            np.ascontiguousarray(samples, dtype=np.float32), timestamps
+        )
 
     def push_acc_chunk(self, samples: np.ndarray, timestamp: Optional[float] = None) -> None:
         """Push accelerometer samples to the LSL stream.
 
         Args:
-            samples: numpy array of shape (n_samples, 3) - typically (3, 3) for 3 samples × 3 axes
-                     Values should be in g (gravitational acceleration)
+            samples: C-contiguous float32 ndarray of shape (n_samples, 3),
+                     typically (3, 3). Values should be in g (gravitational
+                     acceleration). Other dtypes/layouts force a copy.
             timestamp: Optional LSL timestamp (uses current time if None)
 
         Raises:
@@ -176,21 +189,25 @@ class MuseLSLStreamer:
         if timestamp is None:
             timestamp = pylsl.local_clock()
 
-        # Push each sample with appropriate timestamp
-        if samples.shape[0] > 1:
-            time_per_sample = 1.0 / ACC_SAMPLE_RATE
-            for i, sample in enumerate(samples):
-                sample_timestamp = timestamp + (i * time_per_sample)
-                self.acc_outlet.push_sample(sample.tolist(), sample_timestamp)
-        else:
-            self.acc_outlet.push_sample(samples[0].tolist(), timestamp)
+        # Single push_chunk call with per-sample timestamps
+        n = samples.shape[0]
+        offsets = (
+            _ACC_TS_OFFSETS[:n]
+            if n <= _ACC_TS_OFFSETS.shape[0]
+            else np.arange(n, dtype=np.float64) / ACC_SAMPLE_RATE
+        )
+        timestamps = (timestamp + offsets).tolist()
+        self.acc_outlet.push_chunk(
+            np.ascontiguousarray(samples, dtype=np.float32), timestamps
+        )
 
     def push_gyro_chunk(self, samples: np.ndarray, timestamp: Optional[float] = None) -> None:
         """Push gyroscope samples to the LSL stream.
 
         Args:
-            samples: numpy array of shape (n_samples, 3) - typically (3, 3) for 3 samples × 3 axes
-                     Values should be in deg/s (degrees per second)
+            samples: C-contiguous float32 ndarray of shape (n_samples, 3),
+                     typically (3, 3). Values should be in deg/s (degrees per
+                     second). Other dtypes/layouts force a copy.
             timestamp: Optional LSL timestamp (uses current time if None)
 
         Raises:
@@ -202,14 +219,17 @@ class MuseLSLStreamer:
         if timestamp is None:
             timestamp = pylsl.local_clock()
 
-        # Push each sample with appropriate timestamp
-        if samples.shape[0] > 1:
-            time_per_sample = 1.0 / GYRO_SAMPLE_RATE
-            for i, sample in enumerate(samples):
-                sample_timestamp = timestamp + (i * time_per_sample)
-                self.gyro_outlet.push_sample(sample.tolist(), sample_timestamp)
-        else:
-            self.gyro_outlet.push_sample(samples[0].tolist(), timestamp)
+        # Single push_chunk call with per-sample timestamps
+        n = samples.shape[0]
+        offsets = (
+            _GYRO_TS_OFFSETS[:n]
+            if n <= _GYRO_TS_OFFSETS.shape[0]
+            else np.arange(n, dtype=np.float64) / GYRO_SAMPLE_RATE
+        )
+        timestamps = (timestamp + offsets).tolist()
+        self.gyro_outlet.push_chunk(
+            np.ascontiguousarray(samples, dtype=np.float32), timestamps
+        )
 
     def close_streams(self) -> None:
         """Cleanup and close all LSL outlets.
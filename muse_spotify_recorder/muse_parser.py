@@ -9,26 +9,139 @@ https://github.com/alexandrebarachant/muse-lsl
 EEG data: 12-bit samples packed into bytes, converted to microvolts (µV)
 Accelerometer data: int16 samples, converted to g (gravitational acceleration)
 Gyroscope data: int16 samples, converted to deg/s (degrees per second)
+
+Packet-size validation uses assert statements, so running with
+``python -O`` strips the checks from the hot path entirely. The JIT
+kernel compiles with bounds checking on regardless, so a truncated
+packet under ``-O`` raises IndexError instead of reading past the
+buffer; the NumPy fallback likewise fails on a shape mismatch.
+
+The hot EEG unpack is JIT-compiled with numba when available (see
+_parse_eeg_core). A Cython/cffi extension would buy little on top of the
+JIT kernel at these packet rates and would force a build step onto what
+is currently a pure-Python install, so the package deliberately stays
+extension-free.
 """
 
-from typing import Tuple
+import struct
+from typing import Final, Tuple
 import numpy as np
-import bitstring
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pure-Python parsers
+    njit = None
 
 
 # Constants (from muse-lsl)
 # EEG conversion factor: maps 12-bit range (0-4095) centered at 2048 to µV
-EEG_SCALE_FACTOR = 0.48828125  # microvolts per unit
+EEG_SCALE_FACTOR: Final[float] = 0.48828125  # microvolts per unit
 
 # Accelerometer conversion factor: converts int16 to g (gravitational acceleration)
-ACC_SCALE_FACTOR = 0.0000610352  # g per unit
+ACC_SCALE_FACTOR: Final[float] = 0.0000610352  # g per unit
 
 # Gyroscope conversion factor: converts int16 to deg/s
-GYRO_SCALE_FACTOR = 0.0074768  # degrees/second per unit
+GYRO_SCALE_FACTOR: Final[float] = 0.0074768  # degrees/second per unit
+
+# IMU packet layout: big-endian uint16 index + 9 big-endian int16 samples.
+# Precompiled once so each parse is a single C call.
+_IMU_STRUCT = struct.Struct(">Hhhhhhhhhh")
+
+
+# JIT-compiled EEG unpack kernel (used when numba is installed)
+if njit is not None:
+
+    # boundscheck keeps a truncated packet from reading past the buffer
+    # (numba does no bounds checking by default, and the Python-level
+    # size assert disappears under -O); the cost is negligible at 20
+    # bytes per packet.
+    @njit(cache=True, fastmath=True, boundscheck=True)
+    def _parse_eeg_core(buf: np.ndarray, out: np.ndarray) -> int:
+        """Unpack a 20-byte EEG packet (uint8 view) into ``out``.
+
+        Layout: big-endian uint16 index followed by 12 packed 12-bit
+        samples (two samples per 3 payload bytes). Writes the 12 µV
+        samples into the caller-supplied float32 buffer (strided views
+        are fine) and returns the packet index — no allocation per call.
+        """
+        packet_index = (np.int32(buf[0]) << 8) | np.int32(buf[1])
+        j = 2
+        for i in range(6):
+            b0 = np.int32(buf[j])
+            b1 = np.int32(buf[j + 1])
+            b2 = np.int32(buf[j + 2])
+            out[2 * i] = (((b0 << 4) | (b1 >> 4)) - 2048) * EEG_SCALE_FACTOR
+            out[2 * i + 1] = ((((b1 & 0x0F) << 8) | b2) - 2048) * EEG_SCALE_FACTOR
+            j += 3
+        return packet_index
+
+    # Pre-warm the JIT (or load the on-disk cache) at import so the first
+    # real BLE notification doesn't pay the compile cost. numba compiles
+    # and caches per signature, so warm both output layouts the callers
+    # use: a contiguous vector (parse_eeg_packet) and the strided column
+    # view the EEG sync ring writes into (custom_muse_streamer).
+    _warm_buf = np.zeros(20, dtype=np.uint8)
+    _parse_eeg_core(_warm_buf, np.empty(12, dtype=np.float32))
+    _parse_eeg_core(_warm_buf, np.empty((12, 4), dtype=np.float32)[:, 0])
+    del _warm_buf
+else:
+    _parse_eeg_core = None
 
 
 # EEG Packet Parsing
-def parse_eeg_packet(data: bytes) -> Tuple[int, np.ndarray]:
+def parse_eeg_packet_into(
+    data: bytes,
+    out: np.ndarray,
+    _core=_parse_eeg_core,
+    _frombuffer=np.frombuffer,
+    _uint8=np.uint8,
+) -> int:
+    """Parse a Muse EEG packet into a caller-supplied buffer.
+
+    Writing into a preallocated (possibly strided) float32 view keeps
+    the 256 Hz × 4 channel hot path free of per-packet allocation.
+
+    Args:
+        data: Raw packet bytes (should be 20 bytes)
+        out: float32 array of 12 elements; receives the µV samples
+
+    Returns:
+        The uint16 packet index (sequence number)
+
+    Raises:
+        AssertionError: If packet size is not 20 bytes (stripped by -O)
+
+    The underscore parameters bind hot collaborators as locals
+    (LOAD_FAST instead of LOAD_GLOBAL); callers should not pass them.
+    """
+    assert len(data) == 20, f"EEG packet must be 20 bytes, got {len(data)}"
+
+    buf = _frombuffer(data, dtype=_uint8)
+
+    # Fast path: JIT-compiled unpack kernel
+    if _core is not None:
+        return _core(buf, out)
+
+    # Vectorized unpack: big-endian uint16 index, then 12 big-endian
+    # 12-bit samples — every 3 payload bytes hold two samples.
+    packet_index = (int(buf[0]) << 8) | int(buf[1])
+
+    p = buf[2:].astype(np.uint32)
+    out[0::2] = (p[0::3] << 4) | (p[1::3] >> 4)
+    out[1::2] = ((p[1::3] & 0x0F) << 8) | p[2::3]
+
+    # Convert 12-bit values (0-4095, centered at 2048) to microvolts
+    out -= 2048
+    out *= np.float32(EEG_SCALE_FACTOR)
+
+    return packet_index
+
+
+def parse_eeg_packet(
+    data: bytes,
+    _empty=np.empty,
+    _float32=np.float32,
+) -> Tuple[int, np.ndarray]:
     """Parse a Muse EEG packet.
 
     Muse EEG packets contain:
@@ -43,29 +156,51 @@ def parse_eeg_packet(data: bytes) -> Tuple[int, np.ndarray]:
     Returns:
         Tuple of (packet_index, samples) where:
         - packet_index: uint16 sequence number
-        - samples: numpy array of 12 float values in microvolts (µV)
+        - samples: numpy float32 array of 12 values in microvolts (µV)
 
     Raises:
-        ValueError: If packet size is not 20 bytes
+        AssertionError: If packet size is not 20 bytes (stripped by -O)
     """
-    if len(data) != 20:
-        raise ValueError(f"EEG packet must be 20 bytes, got {len(data)}")
+    out = _empty(12, dtype=_float32)
+    return parse_eeg_packet_into(data, out), out
+
+# IMU Packet Parsing
+def _parse_imu(
+    data: bytes,
+    scale: np.float32,
+    _unpack=_IMU_STRUCT.unpack_from,
+    _array=np.array,
+    _float32=np.float32,
+) -> Tuple[int, np.ndarray]:
+    """Unpack an IMU (ACC/GYRO) packet and scale to physical units.
+
+    ACC and GYRO packets share the same layout and differ only in the
+    scale constant applied to the raw int16 samples. The underscore
+    parameters bind hot collaborators as locals.
+
+    Args:
+        data: Raw packet bytes (20 bytes)
+        scale: Conversion factor from raw units to physical units
 
-    # Use bitstring to unpack the packed 12-bit samples
-    bits = bitstring.Bits(bytes=data)
-    pattern = "uint:16," + "uint:12," * 12
-    unpacked = bits.unpack(pattern)
+    Returns:
+        Tuple of (packet_index, samples) with samples shaped (3, 3),
+        one [x, y, z] sample per row.
+    """
+    vals = _unpack(data)
+    packet_index = vals[0]
 
-    packet_index = unpacked[0]
-    raw_samples = np.array(unpacked[1:], dtype=np.float64)
+    # Reshape from column-major (Fortran order) to (3 samples, 3 axes)
+    raw = _array(vals[1:], dtype=_float32).reshape((3, 3), order='F')
 
-    # Convert 12-bit values (0-4095, centered at 2048) to microvolts
-    samples_uv = EEG_SCALE_FACTOR * (raw_samples - 2048)
+    return packet_index, raw * scale
 
-    return packet_index, samples_uv
 
 # Accelerometer Packet Parsing
-def parse_acc_packet(data: bytes) -> Tuple[int, np.ndarray]:
+def parse_acc_packet(
+    data: bytes,
+    _scale=np.float32(ACC_SCALE_FACTOR),
+    _size=_IMU_STRUCT.size,
+) -> Tuple[int, np.ndarray]:
     """Parse a Muse accelerometer packet.
 
     Accelerometer packets contain:
@@ -87,30 +222,20 @@ def parse_acc_packet(data: bytes) -> Tuple[int, np.ndarray]:
           Each row is one sample: [x, y, z]
 
     Raises:
-        ValueError: If packet size is not 20 bytes
+        AssertionError: If packet size is not 20 bytes (stripped by -O)
     """
-    if len(data) != 20:
-        raise ValueError(f"Accelerometer packet must be 20 bytes, got {len(data)}")
+    assert len(data) == _size, \
+        f"Accelerometer packet must be {_size} bytes, got {len(data)}"
 
-    # Unpack using bitstring
-    bits = bitstring.Bits(bytes=data)
-    pattern = "uint:16," + "int:16," * 9
-    unpacked = bits.unpack(pattern)
-
-    packet_index = unpacked[0]
-    raw_data = np.array(unpacked[1:], dtype=np.float64)
-
-    # Reshape from column-major (Fortran order) to (3 samples, 3 axes)
-    samples = raw_data.reshape((3, 3), order='F')
-
-    # Convert to g units
-    samples_g = samples * ACC_SCALE_FACTOR
-
-    return packet_index, samples_g
+    return _parse_imu(data, _scale)
 
 
 # Gyroscope Packet Parsing
-def parse_gyro_packet(data: bytes) -> Tuple[int, np.ndarray]:
+def parse_gyro_packet(
+    data: bytes,
+    _scale=np.float32(GYRO_SCALE_FACTOR),
+    _size=_IMU_STRUCT.size,
+) -> Tuple[int, np.ndarray]:
     """Parse a Muse gyroscope packet.
 
     Gyroscope packets have the same structure as accelerometer packets:
@@ -129,63 +254,9 @@ def parse_gyro_packet(data: bytes) -> Tuple[int, np.ndarray]:
           Each row is one sample: [x, y, z]
 
     Raises:
-        ValueError: If packet size is not 20 bytes
-    """
-    if len(data) != 20:
-        raise ValueError(f"Gyroscope packet must be 20 bytes, got {len(data)}")
-
-    # Unpack using bitstring
-    bits = bitstring.Bits(bytes=data)
-    pattern = "uint:16," + "int:16," * 9
-    unpacked = bits.unpack(pattern)
-
-    packet_index = unpacked[0]
-    raw_data = np.array(unpacked[1:], dtype=np.float64)
-
-    # Reshape from column-major (Fortran order) to (3 samples, 3 axes)
-    samples = raw_data.reshape((3, 3), order='F')
-
-    # Convert to degrees/second
-    samples_dps = samples * GYRO_SCALE_FACTOR
-
-    return packet_index, samples_dps
-
-
-# Convenience Functions
-def parse_eeg_samples_only(data: bytes) -> np.ndarray:
-    """Parse EEG packet and return only the samples (no packet index).
-
-    Args:
-        data: Raw packet bytes
-
-    Returns:
-        numpy array of 12 float values in microvolts (µV)
-    """
-    _, samples = parse_eeg_packet(data)
-    return samples
-
-
-def parse_acc_samples_only(data: bytes) -> np.ndarray:
-    """Parse accelerometer packet and return only the samples (no packet index).
-
-    Args:
-        data: Raw packet bytes
-
-    Returns:
-        numpy array of shape (3, 3) with values in g units
+        AssertionError: If packet size is not 20 bytes (stripped by -O)
     """
-    _, samples = parse_acc_packet(data)
-    return samples
-
+    assert len(data) == _size, \
+        f"Gyroscope packet must be {_size} bytes, got {len(data)}"
 
-def parse_gyro_samples_only(data: bytes) -> np.ndarray:
-    """Parse gyroscope packet and return only the samples (no packet index).
-
-    Args:
-        data: Raw packet bytes
-
-    Returns:
-        numpy array of shape (3, 3) with values in deg/s
-    """
-    _, samples = parse_gyro_packet(data)
-    return samples
+    return _parse_imu(data, _scale)
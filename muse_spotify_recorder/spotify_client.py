@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import random
+import threading
 import time
+from pathlib import Path
 from typing import Optional
 
 import spotipy
@@ -8,6 +12,7 @@ from rich import box
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
+from spotipy.cache_handler import CacheFileHandler
 from spotipy.oauth2 import SpotifyOAuth
 
 from pylsl import local_clock
@@ -16,34 +21,186 @@ from .models import RecordingConfig, RecordingState, SpotifyTrackInfo
 
 console = Console()
 
+# Stable on-disk locations for the OAuth token and the display name, so
+# repeat sessions skip the browser login and the current_user() call
+_TOKEN_CACHE_PATH = Path("~/.tym_spotify.cache").expanduser()
+_DISPLAY_NAME_CACHE_PATH = Path("~/.tym_spotify.user").expanduser()
+
 
 def create_spotify_client() -> spotipy.Spotify:
     """
     Authenticate with Spotify using Spotipy's OAuth helper.
+
+    The token is cached at a fixed path, so a valid cached token is
+    refreshed silently and no browser opens on repeat starts.
     """
     scope = "user-read-playback-state user-read-currently-playing"
-    auth_manager = SpotifyOAuth(scope=scope, open_browser=True)
+    auth_manager = SpotifyOAuth(
+        scope=scope,
+        open_browser=True,
+        cache_handler=CacheFileHandler(cache_path=str(_TOKEN_CACHE_PATH)),
+    )
     return spotipy.Spotify(auth_manager=auth_manager)
 
 
+def get_display_name(sp: spotipy.Spotify) -> str:
+    """
+    Return the authenticated user's display name.
+
+    The name is cached on disk after the first fetch, saving an HTTP
+    round trip per session; it only changes if the user renames their
+    Spotify account (delete the cache file to re-fetch).
+    """
+    try:
+        name = _DISPLAY_NAME_CACHE_PATH.read_text().strip()
+        if name:
+            return name
+    except OSError:
+        pass
+
+    # display_name can be None for accounts without one; don't cache
+    # that, so a later rename is picked up, and return it as text
+    name = sp.current_user()["display_name"]
+    if name:
+        try:
+            _DISPLAY_NAME_CACHE_PATH.write_text(name)
+        except OSError:
+            pass
+    return str(name)
+
+
+# Consecutive get_playback failures, for exponential backoff
+_playback_attempt = 0
+
+
 def get_playback(sp: spotipy.Spotify) -> Optional[dict]:
     """
     Safely fetch current playback info.
+
+    On a 429 the Retry-After header is honored; other failures back off
+    exponentially (0.5 → 8 s with jitter) so a throttled or flaky
+    connection isn't hammered by the polling loop.
     """
+    global _playback_attempt
     try:
-        return sp.current_playback()
+        playback = sp.current_playback()
+        _playback_attempt = 0
+        return playback
+    except spotipy.exceptions.SpotifyException as e:
+        if e.http_status == 429:
+            retry_after = int((e.headers or {}).get("Retry-After", 1))
+            console.print(
+                f"[yellow]Spotify rate limit hit; waiting {retry_after} s[/yellow]"
+            )
+            time.sleep(retry_after)
+            return None
+        console.print(f"[red]Spotify API error:[/red] {e}")
     except Exception as e:
         console.print(f"[red]Spotify API error:[/red] {e}")
-        return None
 
+    # Transient failure: exponential backoff with jitter
+    backoff = min(8.0, 0.5 * (2 ** _playback_attempt)) * random.uniform(0.5, 1.0)
+    _playback_attempt += 1
+    time.sleep(backoff)
+    return None
+
+
+def _new_status_table() -> Table:
+    """Build the playback status table once; rows are mutated in place."""
+    table = Table(
+        title="Waiting for Spotify playback...",
+        box=box.SIMPLE,
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Status")
+    table.add_column("Value")
+    table.add_row("Track", "—")
+    table.add_row("Album", "—")
+    table.add_row("Duration", "—")
+    table.add_row("Position", "—")
+    table.add_row("State", "—")
+    return table
+
+
+def _new_idle_table() -> Table:
+    """Build the table shown when nothing is playing."""
+    table = Table(
+        title="Waiting for Spotify playback...",
+        box=box.SIMPLE,
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Status")
+    table.add_column("Value")
+    table.add_row("Playback", "No active device / nothing playing")
+    return table
+
+
+def _fill_status_cells(
+    cells: list,
+    track_name: str,
+    artists: str,
+    album: str,
+    duration_ms: int,
+    progress_ms: int,
+    is_playing: bool,
+) -> None:
+    """Overwrite the value column of the prebuilt status table.
 
-def wait_for_spotify_play(
+    Mutating the existing cells skips the Table/column/style
+    construction that rebuilding from scratch pays on every update.
+    """
+    cells[0] = f"{track_name} — {artists}"
+    cells[1] = album
+    cells[2] = f"{duration_ms/1000:.1f} s"
+    cells[3] = f"{progress_ms/1000:.1f} s"
+    cells[4] = "▶️ playing" if is_playing else "⏸ paused"
+
+
+async def _await_enter(prompt: str) -> None:
+    """Wait for Enter without pinning a non-daemon thread on stdin.
+
+    asyncio.to_thread runs on the default executor, whose threads are
+    joined at interpreter exit — a Ctrl+C at the prompt would leave the
+    process hung in input() until the user pressed Enter. A dedicated
+    daemon thread doesn't block exit, and hands the result back to the
+    loop thread-safely.
+    """
+    loop = asyncio.get_running_loop()
+    pressed = asyncio.Event()
+
+    def read_stdin() -> None:
+        try:
+            input(prompt)
+        except (EOFError, KeyboardInterrupt):
+            pass
+        try:
+            loop.call_soon_threadsafe(pressed.set)
+        except RuntimeError:
+            pass  # loop already closed during teardown
+
+    threading.Thread(target=read_stdin, daemon=True, name="arm-prompt").start()
+    await pressed.wait()
+
+
+async def wait_for_spotify_play(
     sp: spotipy.Spotify,
     state: RecordingState,
     cfg: RecordingConfig,
 ) -> SpotifyTrackInfo:
     """
-    Block until Spotify starts playing or the track changes while playing.
+    Wait until Spotify starts playing or the track changes while playing.
+
+    Polls the Spotify API once per spotify_poll_interval_sec (the API is
+    rate-limited on a rolling window, so poll frugally) from a
+    background task, so the display never freezes on an HTTP round
+    trip; between fetches the position row advances from a local
+    estimate based on pylsl.local_clock(). The blocking pieces stay off
+    the main loop — the arm prompt reads stdin on a daemon thread and
+    the HTTP requests (including their backoff sleeps) run in worker
+    threads — so the Muse streamer keeps servicing BLE notifications
+    throughout.
 
     Returns:
         SpotifyTrackInfo with timing metadata aligned to pylsl.local_clock().
@@ -55,73 +212,144 @@ def wait_for_spotify_play(
         "2. Pause playback before arming, if something is already playing.\n"
         "3. [green]Press Enter to arm[/green], then hit [green]Play[/green] in Spotify."
     )
-    input("\nPress Enter to arm and then Play in Spotify...")
+    await _await_enter("\nPress Enter to arm and then Play in Spotify...")
 
     last_track_id: Optional[str] = None
     last_is_playing: bool = False
+    last_render_key = None
+
+    # Debounce for track changes while playing: skipping through a
+    # playlist fires one transition per skip, so require the same track
+    # to survive consecutive polls before treating it as the start
+    pending_track_id: Optional[str] = None
+    pending_count = 0
+
+    # Joined artists string, recomputed only when the track changes
+    artists_track_id: Optional[str] = None
+    artists = ""
+
+    # Last fetched playback fields, rendered between polls with the
+    # position estimated from the local clock
+    cached: Optional[tuple] = None
+    last_progress_ms = 0
+    last_fetch_lsl = 0.0
+    in_flight: Optional[asyncio.Task] = None
+    next_fetch_lsl = 0.0
+
+    # Both tables are built once; updates just mutate the value cells
+    status_table = _new_status_table()
+    status_cells = status_table.columns[1]._cells
+    idle_table = _new_idle_table()
 
     with Live(refresh_per_second=4, console=console) as live:
         while True:
-            playback = get_playback(sp)
             now_lsl = local_clock()
-            now_unix = time.time()
 
-            table = Table(
-                title="Waiting for Spotify playback...",
-                box=box.SIMPLE,
-                show_header=True,
-                header_style="bold magenta",
-            )
-            table.add_column("Status")
-            table.add_column("Value")
-
-            if playback and playback.get("item"):
-                is_playing = playback.get("is_playing", False)
-                item = playback["item"]
-                track_id = item["id"]
-                track_name = item["name"]
-                artists = ", ".join(a["name"] for a in item.get("artists", []))
-                album = item["album"]["name"]
-                duration_ms = item["duration_ms"]
-                progress_ms = playback.get("progress_ms", 0) or 0
-
-                table.add_row("Track", f"{track_name} — {artists}")
-                table.add_row("Album", album)
-                table.add_row("Duration", f"{duration_ms/1000:.1f} s")
-                table.add_row("Position", f"{progress_ms/1000:.1f} s")
-                table.add_row("State", "▶️ playing" if is_playing else "⏸ paused")
-
-                play_started = False
-                if not last_is_playing and is_playing:
-                    play_started = True
-                elif is_playing and last_track_id and track_id != last_track_id:
-                    play_started = True
-
-                last_is_playing = is_playing
-                last_track_id = track_id
-
-                if play_started:
-                    live.update(table)
-                    console.print(
-                        "\n[bold green]Detected playback start.[/bold green] "
-                        "Aligning Muse data to this moment (t = 0)."
-                    )
+            # Kick off a poll when one is due; rendering never waits on
+            # the HTTP round trip
+            if in_flight is None and now_lsl >= next_fetch_lsl:
+                in_flight = asyncio.create_task(asyncio.to_thread(get_playback, sp))
+
+            if in_flight is not None and in_flight.done():
+                playback = in_flight.result()
+                in_flight = None
+                next_fetch_lsl = now_lsl + cfg.spotify_poll_interval_sec
+
+                if playback and playback.get("item"):
+                    is_playing = playback.get("is_playing", False)
+                    item = playback["item"]
+                    track_id = item["id"]
+                    track_name = item["name"]
+                    if track_id != artists_track_id:
+                        artists = ", ".join(a["name"] for a in item.get("artists", []))
+                        artists_track_id = track_id
+                    album = item["album"]["name"]
+                    duration_ms = item["duration_ms"]
+                    progress_ms = playback.get("progress_ms", 0) or 0
+
+                    cached = (track_id, track_name, artists, album,
+                              duration_ms, is_playing)
+                    last_progress_ms = progress_ms
+                    last_fetch_lsl = now_lsl
+
+                    play_started = False
+                    if not last_is_playing and is_playing:
+                        # Pause → play is deliberate; fire immediately
+                        play_started = True
+                        pending_track_id = None
+                        pending_count = 0
+                    elif is_playing and last_track_id and track_id != last_track_id:
+                        # Track changed mid-play: arm the debounce
+                        # instead of starting on a transient skip
+                        pending_track_id = track_id
+                        pending_count = 1
+                    elif is_playing and pending_track_id is not None:
+                        if track_id == pending_track_id:
+                            pending_count += 1
+                            if pending_count >= 2:
+                                play_started = True
+                                pending_track_id = None
+                                pending_count = 0
+                        else:
+                            pending_track_id = track_id
+                            pending_count = 1
+
+                    last_is_playing = is_playing
+                    last_track_id = track_id
+
+                    if play_started:
+                        _fill_status_cells(
+                            status_cells, track_name, artists, album,
+                            duration_ms, progress_ms, is_playing,
+                        )
+                        live.update(status_table)
+                        console.print(
+                            "\n[bold green]Detected playback start.[/bold green] "
+                            "Aligning Muse data to this moment (t = 0)."
+                        )
+
+                        # Sample both clocks back to back at the moment
+                        # of detection, so the unix/LSL pair in the
+                        # metadata describes one instant
+                        started_lsl = local_clock()
+                        started_unix = time.time()
+                        track_info = SpotifyTrackInfo(
+                            track_id=track_id,
+                            track_name=track_name,
+                            artist_name=artists,
+                            album_name=album,
+                            duration_ms=duration_ms,
+                            started_at_unix=started_unix,
+                            started_at_lsl=started_lsl,
+                            playback_position_ms=progress_ms,
+                        )
+                        state.play_detected = True
+                        state.track_info = track_info
+                        return track_info
+                else:
+                    cached = None
 
-                    track_info = SpotifyTrackInfo(
-                        track_id=track_id,
-                        track_name=track_name,
-                        artist_name=artists,
-                        album_name=album,
-                        duration_ms=duration_ms,
-                        started_at_unix=now_unix,
-                        started_at_lsl=now_lsl,
-                        playback_position_ms=progress_ms,
+            # Render from the cache; the position row advances on the
+            # local clock so the display stays smooth between fetches
+            if cached is not None:
+                track_id, track_name, artists, album, duration_ms, is_playing = cached
+                progress_est = last_progress_ms
+                if is_playing:
+                    progress_est += int((now_lsl - last_fetch_lsl) * 1000.0)
+                render_key = (track_id, is_playing, progress_est // 1000)
+                if render_key != last_render_key:
+                    last_render_key = render_key
+                    _fill_status_cells(
+                        status_cells, track_name, artists, album,
+                        duration_ms, progress_est, is_playing,
                     )
-                    state.play_detected = True
-                    state.track_info = track_info
-                    return track_info
+                    live.update(status_table)
             else:
-                table.add_row("Playback", "No active device / nothing playing")
+                render_key = ("idle",)
+                if render_key != last_render_key:
+                    last_render_key = render_key
+                    live.update(idle_table)
 
-            live.update(table)
-            time.sleep(cfg.poll_interval_sec)
+            # Render tick (4 Hz); actual API polling stays at
+            # spotify_poll_interval_sec
+            await asyncio.sleep(0.25)